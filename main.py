@@ -2,10 +2,14 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import pandas as pd
-import yfinance as yf
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import time
+import re
+import threading
+
+from stock_tracker.core import backtest_investment
+
+# Amount cells: full value on save, and any prefix of one while typing
+_NUM_RE = re.compile(r'^\d+(?:\.\d+)?$')
+_PARTIAL_NUM_RE = re.compile(r'^\d*\.?\d*$')
 
 class StockTrackerApp:
     def __init__(self):
@@ -29,24 +33,32 @@ class StockTrackerApp:
         for month in range(1, 13):
             self.tree.insert("", "end", values=(month, 1000))
         self.tree.bind("<Double-1>", self.edit_cell)
+        self._validate_amount = (self.root.register(lambda text: bool(_PARTIAL_NUM_RE.match(text))), "%P")
         
-        tk.Button(self.root, text="Run Backtest", command=self.run_backtest).pack(pady=5)
+        self.run_btn = tk.Button(self.root, text="Run Backtest", command=self.run_backtest)
+        self.run_btn.pack(pady=5)
         tk.Button(self.root, text="View Results", command=self.view_results).pack(pady=5)
         tk.Button(self.root, text="Save to Excel", command=self.save_excel).pack(pady=5)
+        tk.Button(self.root, text="Save to Parquet", command=self.save_parquet).pack(pady=5)
         tk.Button(self.root, text="Exit", command=self.root.quit).pack(pady=5)
 
+        # Results figure is built on first use and reused afterwards
+        self._fig = None
+        self._ax = None
+        self._line = None
+
         self.root.mainloop()
     
     def edit_cell(self, event):
         item = self.tree.identify_row(event.y)
         if item and self.tree.identify_column(event.x) == "#2":
-            entry = tk.Entry(self.root)
+            entry = tk.Entry(self.root, validate="key", validatecommand=self._validate_amount)
             entry.place(x=event.x, y=event.y, anchor="w")
             entry.insert(0, self.tree.item(item, "values")[1])
 
             def save_edit(event):
                 new_value = entry.get()
-                if new_value.replace(".", "").isdigit():
+                if _NUM_RE.match(new_value):
                     self.tree.set(item, column="#2", value=new_value)
                 entry.destroy()  # Cleanup once done
 
@@ -58,24 +70,51 @@ class StockTrackerApp:
         if len(variable_amounts) != 12:
             messagebox.showerror("Error", "Please enter amounts for all 12 months.")
             return
+        # Download on a worker thread so the window stays responsive
+        self.run_btn.config(state="disabled")
+        threading.Thread(target=self._do_backtest, args=(variable_amounts, self.asset_var.get()),
+                         daemon=True).start()
+
+    def _do_backtest(self, variable_amounts, asset_ticker):
+        # Runs off the Tk thread; all widget work is handed back via root.after
         try:
-            self.backtest_df = backtest_investment(variable_amounts, self.asset_var.get())
-            messagebox.showinfo("Backtest", "Backtest completed! View results.")
+            df = backtest_investment(variable_amounts, asset_ticker)
         except ValueError as e:
-            messagebox.showerror("Error", str(e))
+            self.root.after(0, self._backtest_failed, str(e))
         except Exception as e:
-            messagebox.showerror("Error", f"Unexpected error: {e}")
+            self.root.after(0, self._backtest_failed, f"Unexpected error: {e}")
+        else:
+            self.root.after(0, self._backtest_done, df)
+
+    def _backtest_done(self, df):
+        self.backtest_df = df
+        self.run_btn.config(state="normal")
+        messagebox.showinfo("Backtest", "Backtest completed! View results.")
+
+    def _backtest_failed(self, message):
+        self.run_btn.config(state="normal")
+        messagebox.showerror("Error", message)
     
     def view_results(self):
         if hasattr(self, 'backtest_df'):
             try:
-                plt.figure(figsize=(10, 6))
-                plt.plot(self.backtest_df['Date'], self.backtest_df['Current Value'], label="Portfolio Value")
-                plt.title("Investment Growth")
-                plt.xlabel("Date")
-                plt.ylabel("Value (£)")
-                plt.legend()
-                plt.grid(True)
+                # Imported here so app start-up doesn't pay for pyplot
+                import matplotlib.pyplot as plt
+                dates = self.backtest_df['Date']
+                values = self.backtest_df['Current Value']
+                if self._fig is None or not plt.fignum_exists(self._fig.number):
+                    self._fig, self._ax = plt.subplots(figsize=(10, 6))
+                    self._line, = self._ax.plot(dates, values, label="Portfolio Value")
+                    self._ax.set_title("Investment Growth")
+                    self._ax.set_xlabel("Date")
+                    self._ax.set_ylabel("Value (£)")
+                    self._ax.legend()
+                    self._ax.grid(True)
+                else:
+                    self._line.set_data(dates, values)
+                    self._ax.relim()
+                    self._ax.autoscale_view()
+                    self._fig.canvas.draw_idle()
                 plt.show()
             except Exception as e:
                 messagebox.showerror("Plot Error", f"Error plotting: {e}")
@@ -85,128 +124,24 @@ class StockTrackerApp:
     def save_excel(self):
         if hasattr(self, 'backtest_df'):
             try:
-                self.backtest_df.to_excel("backtest_results.xlsx", index=False)
+                # xlsxwriter is faster than the default openpyxl writer
+                with pd.ExcelWriter("backtest_results.xlsx", engine="xlsxwriter") as writer:
+                    self.backtest_df.to_excel(writer, index=False, sheet_name="Backtest")
                 messagebox.showinfo("Saved", "Results saved to backtest_results.xlsx!")
             except Exception as e:
                 messagebox.showerror("Save Error", f"Error saving: {e}")
         else:
             messagebox.showwarning("No Results", "Run backtest first!")
 
-def backtest_investment(variable_amounts, asset_ticker):
-    """
-    Backtest variable monthly investments in a specified asset over the past year.
-    :param variable_amounts: List of monthly investment amounts (£)
-    :param asset_ticker: Ticker symbol of the asset (e.g., '^GSPC', 'GLD', 'AAPL')
-    :return: DataFrame with investment results
-    """
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=365)
-    try:
-        asset_data = yf.download(asset_ticker, start=start_date, end=end_date, progress=False)
-        if asset_data.empty:
-            raise ValueError(f"No data available for {asset_ticker}.")
-    except Exception as e:
-        raise ValueError(f"Failed to download data for {asset_ticker}: {e}")
-    
-    months = len(variable_amounts)
-    investment_dates = pd.date_range(start=start_date, periods=months, freq='MS')
-    portfolio = []
-    total_invested = 0.0
-    total_shares = 0.0
-    
-    if not all(isinstance(x, (int, float)) and x > 0 for x in variable_amounts):
-        raise ValueError("All investment amounts must be positive numbers.")
-    if months > len(asset_data):
-        months = len(asset_data)
-        investment_dates = investment_dates[:months]
-    
-    for i, date in enumerate(investment_dates[:months]):
-        price = float(asset_data['Close'].loc[:date].iloc[-1])
-        if price <= 0:
-            print(f"Warning: Invalid price at {date}, skipping month.")
-            continue
-        amount = float(variable_amounts[i])
-        shares_bought = amount / price
-        total_shares += shares_bought
-        total_invested += amount
-        latest_close = float(asset_data['Close'].iloc[-1])
-        current_value = total_shares * latest_close
-        growth = current_value - total_invested
-        portfolio.append({
-            'Date': date,
-            'Amount': amount,
-            'Price': price,
-            'Shares Bought': shares_bought,
-            'Total Invested': total_invested,
-            'Current Value': current_value,
-            'Growth': growth
-        })
-    
-    df = pd.DataFrame(portfolio)
-    return df
-
-def fetch_stock_data(tickers: list, period="1mo", interval="1d"):
-    """
-    Fetch stock price data from Yahoo Finance.
-    """
-    data_dict = {}
-    for ticker in tickers:
-        for attempt in range(3):
+    def save_parquet(self):
+        if hasattr(self, 'backtest_df'):
             try:
-                stock = yf.Ticker(ticker)
-                data = stock.history(period=period, interval=interval)
-                if not data.empty:
-                    data_dict[ticker] = data
-                    break
-                else:
-                    print(f"Empty data for {ticker}, retrying...")
+                self.backtest_df.to_parquet("backtest_results.parquet", index=False)
+                messagebox.showinfo("Saved", "Results saved to backtest_results.parquet!")
             except Exception as e:
-                print(f"Attempt {attempt + 1} failed for {ticker}: {e}")
-                if attempt < 2:
-                    time.sleep(2 ** attempt)
+                messagebox.showerror("Save Error", f"Error saving: {e}")
         else:
-            print(f"Failed to fetch data for {ticker} after 3 attempts")
-    return data_dict
-
-def plot_stock_data(data_dict):
-    """
-    Plot closing prices for multiple stocks from a dictionary of data.
-    """
-    plt.figure(figsize=(12, 8))
-    for ticker, data in data_dict.items():
-        if not data.empty:
-            plt.plot(data.index, data['Close'], label=f"{ticker} Closing Price")
-    plt.title("Multiple Stock Prices")
-    plt.xlabel("Date")
-    plt.ylabel("Price (USD)")
-    plt.legend()
-    plt.grid(True)
-    plt.show()
-
-def check_price_alerts(data_dict, target_prices):
-    """
-    Check if stock prices exceed inputted target prices above and below and print alerts.
-    """
-    alerts = []
-    for ticker in data_dict:
-        if ticker in target_prices:
-            latest_price = float(data_dict[ticker]['Close'].iloc[-1])
-            if latest_price > target_prices[ticker]:
-                alerts.append(f"Alert: {ticker} price above target {target_prices[ticker]}!")
-            elif latest_price < target_prices[ticker]:
-                alerts.append(f"Alert: {ticker} price below target {target_prices[ticker]}!")
-    return alerts
-
-def save_to_file(data_dict, target_prices, alerts):
-    """
-    Save alerts to a text file and stock data to a CSV file with timestamps.
-    """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open("alerts.txt", "a") as f:
-        for alert in alerts:
-            f.write(f"{timestamp}: {alert}\n")
-    for ticker, data in data_dict.items():
-        data.tail().to_csv("data.csv", mode="a", header=(ticker == list(data_dict.keys())[0]))
+            messagebox.showwarning("No Results", "Run backtest first!")
 
 if __name__ == "__main__":
     app = StockTrackerApp()
\ No newline at end of file
@@ -0,0 +1,363 @@
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from datetime import datetime, timedelta
+import os
+import re
+import time
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+def _make_session():
+    """
+    Build one HTTP session shared by every yfinance call so connections stay warm.
+    Recent yfinance requires a curl_cffi session; older releases take a requests one.
+    """
+    try:
+        from curl_cffi import requests as curl_requests
+        return curl_requests.Session(impersonate="chrome")
+    except ImportError:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        session.mount("https://", HTTPAdapter(pool_maxsize=16, max_retries=retry))
+        return session
+
+# Created on first fetch so importing this module stays cheap
+_session = None
+_session_lock = threading.Lock()
+
+def _get_session():
+    """
+    Return the shared HTTP session, building it on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _make_session()
+    return _session
+
+# In-memory caches so repeat fetches skip the network; history entries are
+# (fetched_at, DataFrame) and expire after _fetch_ttl(interval) seconds
+_ticker_cache = {}
+_history_cache = {}
+
+# Upper bound on how long a fetch_stock_data result is reused
+FETCH_TTL = 900
+
+def _fetch_ttl(interval):
+    """
+    Seconds a fetch_stock_data result stays fresh: one bar for intraday
+    intervals (e.g. '5m', '1h'), capped at FETCH_TTL.
+    """
+    match = re.fullmatch(r"(\d+)([mh])", interval)
+    if match:
+        bar = int(match.group(1)) * (60 if match.group(2) == "m" else 3600)
+        return min(bar, FETCH_TTL)
+    return FETCH_TTL
+
+def _cached_history(key):
+    """
+    Return the in-memory frame for (ticker, period, interval, mode) if still fresh.
+    """
+    entry = _history_cache.get(key)
+    if entry is not None and time.time() - entry[0] < _fetch_ttl(key[2]):
+        return entry[1]
+    return None
+
+# On-disk cache of downloaded prices. Date-bounded backtest downloads are
+# reused for a day; fetch_stock_data results follow _fetch_ttl(interval).
+CACHE_DIR = Path.home() / ".cache" / "stock-tracker"
+CACHE_TTL = 86400
+
+def _cache_path(*parts):
+    """
+    Build a cache file path from the fetch key, e.g. ('^GSPC', '20250101', '1d').
+    """
+    name = re.sub(r"[^\w.-]", "-", "_".join(str(p) for p in parts))
+    return CACHE_DIR / f"{name}.parquet"
+
+def _read_cache(path, ttl=CACHE_TTL):
+    """
+    Return the cached DataFrame at path if it is younger than ttl seconds, else None.
+    """
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            return pd.read_parquet(path)
+    except Exception:
+        # Missing, unreadable or no parquet engine: treat as a cache miss
+        pass
+    return None
+
+def _write_cache(path, df):
+    """
+    Save df to path, ignoring failures so caching never breaks a fetch.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path)
+    except Exception as e:
+        print(f"Could not cache {path.name}: {e}")
+
+def _cached_download(symbol, start, end, interval="1d"):
+    """
+    yf.download for a single symbol, served from the on-disk cache when fresh.
+    """
+    path = _cache_path(symbol, f"{start:%Y%m%d}", f"{end:%Y%m%d}", interval)
+    df = _read_cache(path)
+    if df is not None:
+        return df
+    df = yf.download(symbol, start=start, end=end, interval=interval, progress=False, session=_get_session())
+    if not df.empty:
+        _write_cache(path, df)
+    return df
+
+# Reused by plot_stock_data: one figure, one Line2D per ticker
+_stock_fig = None
+_stock_ax = None
+_stock_lines = {}
+
+def _backtest_loop(prices, amounts, latest_close):
+    """
+    Compute shares bought, cumulative invested, current value and growth per month.
+    """
+    n = prices.shape[0]
+    shares = np.empty(n)
+    invested = np.empty(n)
+    value = np.empty(n)
+    growth = np.empty(n)
+    total_shares = 0.0
+    total_invested = 0.0
+    for i in range(n):
+        shares[i] = amounts[i] / prices[i]
+        total_shares += shares[i]
+        total_invested += amounts[i]
+        invested[i] = total_invested
+        value[i] = total_shares * latest_close
+        growth[i] = value[i] - total_invested
+    return shares, invested, value, growth
+
+# _backtest_loop JIT-compiled by numba when installed; resolved on first backtest
+# so importing this module doesn't pay for importing numba
+_compiled_kernel = None
+
+def _backtest_kernel(prices, amounts, latest_close):
+    """
+    Run _backtest_loop, compiling it with numba on first call if available.
+    """
+    global _compiled_kernel
+    if _compiled_kernel is None:
+        try:
+            from numba import njit
+            _compiled_kernel = njit(cache=True)(_backtest_loop)
+        except ImportError:
+            # Numba is optional; fall back to plain Python/NumPy
+            _compiled_kernel = _backtest_loop
+    return _compiled_kernel(prices, amounts, latest_close)
+
+def backtest_investment(variable_amounts, asset_ticker):
+    """
+    Backtest variable monthly investments in a specified asset over the past year.
+    :param variable_amounts: List of monthly investment amounts (£)
+    :param asset_ticker: Ticker symbol of the asset (e.g., '^GSPC', 'GLD', 'AAPL')
+    :return: DataFrame with investment results
+    """
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=365)
+    try:
+        asset_data = _cached_download(asset_ticker, start_date, end_date)
+        if asset_data.empty:
+            raise ValueError(f"No data available for {asset_ticker}.")
+    except Exception as e:
+        raise ValueError(f"Failed to download data for {asset_ticker}: {e}")
+    
+    months = len(variable_amounts)
+    investment_dates = pd.date_range(start=start_date, periods=months, freq='MS')
+    
+    try:
+        amounts = np.asarray(variable_amounts, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("All investment amounts must be positive numbers.")
+    if amounts.ndim != 1 or not np.isfinite(amounts).all() or (amounts <= 0).any():
+        raise ValueError("All investment amounts must be positive numbers.")
+    if months > len(asset_data):
+        months = len(asset_data)
+        investment_dates = investment_dates[:months]
+    
+    close = asset_data['Close']
+    if isinstance(close, pd.DataFrame):
+        # Newer yfinance returns (Price, Ticker) columns even for one ticker
+        close = close.iloc[:, 0]
+    close_vals = close.to_numpy(dtype=np.float64, copy=False)
+    latest_close = float(close_vals[-1])
+    # Index is sorted, so the last close on or before each date is a binary search
+    pos = np.searchsorted(close.index.values, investment_dates.values, side='right') - 1
+    prices = np.where(pos >= 0, close_vals[np.maximum(pos, 0)], np.nan)
+    amounts = amounts[:months]
+    
+    valid = prices > 0
+    for date in investment_dates[~valid]:
+        print(f"Warning: Invalid price at {date}, skipping month.")
+    investment_dates, prices, amounts = investment_dates[valid], prices[valid], amounts[valid]
+    
+    shares, total_invested, current_value, growth = _backtest_kernel(
+        prices, amounts, latest_close)
+    
+    df = pd.DataFrame({
+        'Date': investment_dates,
+        'Amount': amounts,
+        'Price': prices,
+        'Shares Bought': shares,
+        'Total Invested': total_invested,
+        'Current Value': current_value,
+        'Growth': growth
+    }, copy=False)
+    return df
+
+def _fetch_one(ticker, period, interval):
+    """
+    Fetch a single ticker's history, retrying up to 3 times.
+    Returns (ticker, DataFrame) or (ticker, None) on failure.
+    """
+    for attempt in range(3):
+        try:
+            stock = _ticker_cache.get(ticker)
+            if stock is None:
+                stock = _ticker_cache.setdefault(ticker, yf.Ticker(ticker, session=_get_session()))
+            data = stock.history(period=period, interval=interval, timeout=10)
+            if not data.empty:
+                _history_cache[(ticker, period, interval, "history")] = (time.time(), data)
+                _write_cache(_cache_path(ticker, period, interval, "history"), data)
+                return ticker, data
+            print(f"Empty data for {ticker}, retrying...")
+        except Exception as e:
+            print(f"Attempt {attempt + 1} failed for {ticker}: {e}")
+        if attempt < 2:
+            time.sleep(2 ** attempt)
+    print(f"Failed to fetch data for {ticker} after 3 attempts")
+    return ticker, None
+
+def fetch_stock_data(tickers: list, period="1mo", interval="1d", batch=True):
+    """
+    Fetch stock price data from Yahoo Finance.
+    With batch=True all tickers are requested in a single batched download.
+    With batch=False each ticker's full Ticker.history (including Dividends and
+    Stock Splits) is fetched concurrently on a thread pool.
+    Results are cached per (ticker, period, interval, mode) in memory and on disk,
+    so batch and per-ticker frames (which have different columns) never mix.
+    """
+    mode = "download" if batch else "history"
+    data_dict = {}
+    for ticker in tickers:
+        cached = _cached_history((ticker, period, interval, mode))
+        if cached is None:
+            cached = _read_cache(_cache_path(ticker, period, interval, mode), _fetch_ttl(interval))
+        if cached is not None:
+            data_dict[ticker] = cached
+    missing = [t for t in tickers if t not in data_dict]
+    if not missing:
+        return data_dict
+    if not batch:
+        with ThreadPoolExecutor(max_workers=min(8, len(missing))) as ex:
+            futures = [ex.submit(_fetch_one, t, period, interval) for t in missing]
+            for future in as_completed(futures):
+                ticker, data = future.result()
+                if data is not None:
+                    data_dict[ticker] = data
+        # Keep the caller's ticker order regardless of completion order
+        return {t: data_dict[t] for t in tickers if t in data_dict}
+
+    for attempt in range(3):
+        try:
+            df = yf.download(" ".join(missing), period=period, interval=interval,
+                             group_by='ticker', threads=True, progress=False, session=_get_session())
+            if not df.empty:
+                break
+            print("Empty data, retrying...")
+        except Exception as e:
+            print(f"Attempt {attempt + 1} failed: {e}")
+        if attempt < 2:
+            time.sleep(2 ** attempt)
+    else:
+        print(f"Failed to fetch data for {missing} after 3 attempts")
+        return data_dict
+
+    if not isinstance(df.columns, pd.MultiIndex):
+        # Older yfinance returns flat columns for a single ticker
+        df = pd.concat({missing[0]: df}, axis=1)
+    fetched = df.columns.get_level_values(0)
+    for ticker in missing:
+        if ticker in fetched:
+            data = df[ticker].dropna(how='all')
+            if not data.empty:
+                _history_cache[(ticker, period, interval, mode)] = (time.time(), data)
+                _write_cache(_cache_path(ticker, period, interval, mode), data)
+                data_dict[ticker] = data
+                continue
+        print(f"Failed to fetch data for {ticker}")
+    return {t: data_dict[t] for t in tickers if t in data_dict}
+
+def plot_stock_data(data_dict):
+    """
+    Plot closing prices for multiple stocks from a dictionary of data.
+    The figure and each ticker's line are reused across calls while the window is open.
+    """
+    global _stock_fig, _stock_ax
+    import matplotlib.pyplot as plt
+    if _stock_fig is None or not plt.fignum_exists(_stock_fig.number):
+        _stock_fig, _stock_ax = plt.subplots(figsize=(12, 8))
+        _stock_ax.set_title("Multiple Stock Prices")
+        _stock_ax.set_xlabel("Date")
+        _stock_ax.set_ylabel("Price (USD)")
+        _stock_ax.grid(True)
+        _stock_lines.clear()
+    for ticker in list(_stock_lines):
+        if ticker not in data_dict or data_dict[ticker].empty:
+            _stock_lines.pop(ticker).remove()
+    for ticker, data in data_dict.items():
+        if not data.empty:
+            if ticker in _stock_lines:
+                _stock_lines[ticker].set_data(data.index, data['Close'])
+            else:
+                _stock_lines[ticker], = _stock_ax.plot(data.index, data['Close'], label=f"{ticker} Closing Price")
+    _stock_ax.relim()
+    _stock_ax.autoscale_view()
+    _stock_ax.legend()
+    _stock_fig.canvas.draw_idle()
+    plt.show()
+
+def check_price_alerts(data_dict, target_prices):
+    """
+    Check if stock prices exceed inputted target prices above and below and print alerts.
+    """
+    alerts = []
+    for ticker, df in data_dict.items():
+        target = target_prices.get(ticker)
+        if target is None:
+            continue
+        latest_price = float(df['Close'].iat[-1])
+        if latest_price > target:
+            alerts.append(f"Alert: {ticker} price above target {target}!")
+        elif latest_price < target:
+            alerts.append(f"Alert: {ticker} price below target {target}!")
+    return alerts
+
+# Columns written to data.csv; common to yf.download and Ticker.history output
+CSV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+def save_to_file(data_dict, target_prices, alerts):
+    """
+    Save alerts to a text file and stock data to a CSV file with timestamps.
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open("alerts.txt", "a") as f:
+        f.write("".join(f"{timestamp}: {alert}\n" for alert in alerts))
+    if data_dict:
+        combined = pd.concat({ticker: data.tail() for ticker, data in data_dict.items()}, names=['Ticker'])
+        # Fixed layout so appends line up whichever fetch mode produced the frames
+        combined = combined.reindex(columns=CSV_COLUMNS)
+        combined.to_csv("data.csv", mode="a", header=not os.path.exists("data.csv"))